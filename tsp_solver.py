@@ -3,16 +3,149 @@ TSP Solver implementing brute force and nearest neighbor approximation algorithm
 Includes timing and comparison utilities for analyzing computational limits.
 """
 
+import array
+import functools
 import json
 import time
 import itertools
 import sys
+from multiprocessing import Pool
 from pathlib import Path
 
+import numpy as np
+
+# orjson parses JSON in C several times faster than stdlib json; optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# CuPy offloads the Held-Karp table fill to a CUDA GPU for large n;
+# optional, and only used when a device is actually present
+try:
+    import cupy as cp
+    CUPY_AVAILABLE = cp.cuda.runtime.getDeviceCount() > 0
+except Exception:
+    cp = None
+    CUPY_AVAILABLE = False
+
+# ============================================================================
+# OPTIONAL NUMBA FAST PATHS
+# ============================================================================
+
+# When Numba is installed, the tight numeric kernels below are JIT-compiled
+# to native code (the loops autovectorize and integer/float boxing goes
+# away). Everything falls back to the NumPy paths when it is missing.
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _score_routes_numba(D, routes):
+        """Total edge cost of each route (one row of `routes`) under D."""
+        out = np.empty(routes.shape[0])
+        for r in range(routes.shape[0]):
+            total = 0.0
+            for i in range(routes.shape[1] - 1):
+                total += D[routes[r, i], routes[r, i + 1]]
+            out[r] = total
+        return out
+
+    @njit(cache=True, fastmath=True)
+    def _held_karp_numba(D):
+        """Iterative Held-Karp table fill; returns (dp, parent)."""
+        n = D.shape[0]
+        num_subsets = 1 << (n - 1)
+        dp = np.full((num_subsets, n), np.inf)
+        parent = np.full((num_subsets, n), -1, dtype=np.int64)
+        for k in range(1, n):
+            dp[1 << (k - 1), k] = D[0, k]
+            parent[1 << (k - 1), k] = 0
+        for mask in range(1, num_subsets):
+            for k in range(1, n):
+                if not (mask >> (k - 1)) & 1:
+                    continue
+                prev_mask = mask ^ (1 << (k - 1))
+                if prev_mask == 0:
+                    continue
+                best_cost = np.inf
+                best_prev = -1
+                for j in range(1, n):
+                    if not (prev_mask >> (j - 1)) & 1:
+                        continue
+                    cost = dp[prev_mask, j] + D[j, k]
+                    if cost < best_cost:
+                        best_cost = cost
+                        best_prev = j
+                dp[mask, k] = best_cost
+                parent[mask, k] = best_prev
+        return dp, parent
+
+# ============================================================================
+# OPTIONAL CUPY (GPU) HELD-KARP
+# ============================================================================
+
+if CUPY_AVAILABLE:
+    def _held_karp_cupy(D):
+        """
+        Held-Karp table fill on the GPU; returns (dp, parent) as NumPy.
+
+        Masks of equal popcount have no dependencies on each other, so each
+        subset-size layer is updated as a batch: for a fixed next location
+        k, the min over predecessors runs for every mask of the layer in
+        one device-wide reduction.
+        """
+        n = D.shape[0]
+        num_subsets = 1 << (n - 1)
+        D_g = cp.asarray(D)
+        dp = cp.full((num_subsets, n), cp.inf)
+        parent = cp.full((num_subsets, n), -1, dtype=cp.int64)
+
+        for k in range(1, n):
+            dp[1 << (k - 1), k] = D_g[0, k]
+            parent[1 << (k - 1), k] = 0
+
+        # Predecessor membership test: bit j-1 of a mask, for j = 1..n-1
+        j_shifts = cp.arange(n - 1)[None, :]
+
+        for size in range(2, n):
+            # Bitmasks of this layer, built on the CPU once per size
+            members = np.array(list(itertools.combinations(range(1, n), size)),
+                               dtype=np.int64)
+            masks_np = np.zeros(len(members), dtype=np.int64)
+            for c in range(size):
+                masks_np |= 1 << (members[:, c] - 1)
+            masks = cp.asarray(masks_np)
+
+            for k in range(1, n):
+                bit = 1 << (k - 1)
+                sel = masks[(masks & bit) != 0]
+                prev = sel ^ bit
+                # Candidate cost through every predecessor j; locations
+                # outside the previous mask are masked to +inf
+                cand = dp[prev][:, 1:] + D_g[1:, k][None, :]
+                in_prev = ((prev[:, None] >> j_shifts) & 1).astype(bool)
+                cand = cp.where(in_prev, cand, cp.inf)
+                dp[sel, k] = cand.min(axis=1)
+                parent[sel, k] = cand.argmin(axis=1) + 1
+
+        return cp.asnumpy(dp), cp.asnumpy(parent)
+
 # ============================================================================
 # BRUTE FORCE SOLUTION
 # ============================================================================
 
+# The comparison-heavy searches (permutation scan, branch and bound) work on
+# distances scaled by this factor and rounded to int64: integer adds and
+# compares skip float NaN handling, and equality/pruning tests become exact.
+# At 10^7 the quantization error per edge is below 5e-8 grid units, far under
+# the 2-decimal display precision, and a 20-edge tour stays well inside both
+# int64 and exact-float range.
+DISTANCE_SCALE = 10 ** 7
+
 def tsp_brute_force(distances, timeout=60):
     """
     Find optimal TSP route by checking all possible permutations.
@@ -25,41 +158,389 @@ def tsp_brute_force(distances, timeout=60):
         Tuple of (best_route, best_distance) or (None, None) if timeout
     """
     n = len(distances)
+    D = np.asarray(distances, dtype=np.float64)
     locations = list(range(n))
-    
+
     # Start at location 0 (dispatch center)
     start = 0
     other_locations = [i for i in locations if i != start]
-    
+
+    # Deadline on the monotonic clock: immune to NTP/wall-clock skew, and
+    # computed once instead of re-deriving elapsed time on every poll
+    deadline = time.monotonic() + timeout
+
+    best_route, best_distance, routes_checked, timed_out = _scan_permutations(
+        D, (start,), other_locations, deadline)
+
+    if timed_out:
+        print(f"    TIMEOUT after checking {routes_checked:,} routes")
+        return None, None
+
+    return best_route, best_distance
+
+def _scan_permutations(D, prefix, rest, deadline):
+    """
+    Score every route of the form prefix -> perm(rest) -> start.
+
+    Permutations are buffered into CHUNK-sized batches so the edge gather
+    and reduction run once per batch instead of once per route. The fixed
+    prefix occupies the leading buffer columns; only the tail changes.
+
+    Returns:
+        Tuple of (best_route, best_distance, routes_checked, timed_out)
+    """
+    n = D.shape[0]
+    p = len(prefix)
+    # Score against the scaled integer matrix; comparisons are exact and
+    # integer adds are cheaper than float in the hot reduction
+    D_int = np.rint(D * DISTANCE_SCALE).astype(np.int64)
     best_distance = float('inf')
     best_route = None
-    start_time = time.time()
     routes_checked = 0
-    
-    # Check all permutations of locations (excluding start)
-    for perm in itertools.permutations(other_locations):
-        # Check if we've exceeded timeout
-        if time.time() - start_time > timeout:
-            print(f"    TIMEOUT after checking {routes_checked:,} routes")
-            return None, None
-        
-        # Build full route: start -> permutation -> back to start
-        route = [start] + list(perm) + [start]
-        
-        # Calculate total distance for this route
-        distance = 0
-        for i in range(len(route) - 1):
-            distance += distances[route[i]][route[i + 1]]
-        
-        # Update best if this is better
-        if distance < best_distance:
-            best_distance = distance
-            best_route = route[:-1]  # Remove duplicate start at end
-        
-        routes_checked += 1
-    
+
+    CHUNK = 4096
+    buf = np.empty((CHUNK, n + 1), dtype=np.intp)
+    buf[:, :p] = prefix
+    buf[:, -1] = prefix[0]
+
+    perm_iter = itertools.permutations(rest)
+    while True:
+        chunk = list(itertools.islice(perm_iter, CHUNK))
+        if not chunk:
+            break
+
+        count = len(chunk)
+        buf[:count, p:-1] = chunk
+
+        # Edge costs for all routes in the batch at once
+        if NUMBA_AVAILABLE:
+            costs = _score_routes_numba(D_int, buf[:count])
+        else:
+            costs = D_int[buf[:count, :-1], buf[:count, 1:]].sum(axis=1)
+        idx = int(costs.argmin())
+        if costs[idx] < best_distance:
+            best_distance = float(costs[idx])
+            best_route = buf[idx, :-1].tolist()  # Remove duplicate start at end
+
+        routes_checked += count
+
+        # Check the deadline once per batch rather than once per route
+        if time.monotonic() > deadline:
+            return best_route, best_distance / DISTANCE_SCALE, routes_checked, True
+
+    return best_route, best_distance / DISTANCE_SCALE, routes_checked, False
+
+def _search_second_city(args):
+    """
+    Worker for tsp_brute_force_parallel: scan the (n-2)! routes whose
+    second stop is fixed to one particular location.
+    """
+    D, second, deadline = args
+    n = D.shape[0]
+    rest = [c for c in range(1, n) if c != second]
+    return _scan_permutations(D, (0, second), rest, deadline)
+
+def tsp_brute_force_parallel(distances, timeout=60):
+    """
+    Brute force across all CPU cores.
+
+    The (n-1)! permutations partition into n-1 disjoint groups by the
+    second location of the tour, each of size (n-2)!. Every group goes to
+    a worker process with its own copy of the distance matrix, so the
+    scans run truly in parallel and the results reduce with a single min.
+    Near-linear speedup in core count; same exact guarantee as
+    tsp_brute_force.
+
+    Args:
+        distances: 2D list where distances[i][j] is distance from location i to j
+        timeout: Maximum seconds to run before stopping (default 60)
+
+    Returns:
+        Tuple of (best_route, best_distance) or (None, None) if timeout
+    """
+    n = len(distances)
+    if n < 4:
+        return tsp_brute_force(distances, timeout)
+
+    D = np.asarray(distances, dtype=np.float64)
+    deadline = time.monotonic() + timeout
+
+    with Pool() as pool:
+        results = pool.map(_search_second_city,
+                           [(D, second, deadline) for second in range(1, n)])
+
+    if any(timed_out for _, _, _, timed_out in results):
+        routes_checked = sum(checked for _, _, checked, _ in results)
+        print(f"    TIMEOUT after checking {routes_checked:,} routes")
+        return None, None
+
+    best_route, best_distance, _, _ = min(results, key=lambda r: r[1])
     return best_route, best_distance
 
+# ============================================================================
+# BRANCH AND BOUND
+# ============================================================================
+
+def tsp_branch_and_bound(distances, timeout=60):
+    """
+    Find optimal TSP route with a depth-first search that prunes bad branches.
+
+    Unlike brute force, which scores every complete permutation, this abandons
+    a partial route as soon as a lower bound on its best possible completion
+    already meets the best full route found so far. Routes with expensive
+    prefixes die at depth 2-3 instead of being extended (n-1)! ways. Worst
+    case is still factorial, but on Euclidean inputs the searched tree is
+    usually orders of magnitude smaller.
+
+    Args:
+        distances: 2D list where distances[i][j] is distance from location i to j
+        timeout: Maximum seconds to run before stopping (default 60)
+
+    Returns:
+        Tuple of (best_route, best_distance) or (None, None) if timeout
+    """
+    n = len(distances)
+    if n == 1:
+        return [0], 0
+
+    # Search on the scaled integer matrix: bound comparisons against the
+    # incumbent become exact, with no float rounding at the prune frontier
+    D = np.rint(np.asarray(distances, dtype=np.float64) * DISTANCE_SCALE).astype(np.int64)
+
+    # Seed the incumbent with nearest neighbor so pruning has a tight
+    # bound from the very first branch
+    best_route, _ = tsp_nearest_neighbor(distances)
+    nn_r = np.asarray(best_route)
+    best_distance = int(D[nn_r, np.roll(nn_r, -1)].sum())
+
+    # Cheapest edge leaving each location: any completion must still leave
+    # the current location and every unvisited one, so the sum of these is
+    # a valid lower bound on the remaining cost
+    min_out = np.where(np.eye(n, dtype=bool), np.iinfo(np.int64).max, D).min(axis=1)
+
+    full_mask = (1 << n) - 1
+    deadline = time.monotonic() + timeout
+    state = {'nodes': 0, 'timed_out': False}
+    prefix = [0]
+
+    def dfs(current, visited_mask, partial):
+        nonlocal best_route, best_distance
+
+        # Poll the clock every 4096 nodes rather than on each one
+        state['nodes'] += 1
+        if state['nodes'] & 0xFFF == 0 and time.monotonic() > deadline:
+            state['timed_out'] = True
+        if state['timed_out']:
+            return
+
+        if visited_mask == full_mask:
+            total = partial + D[current, 0]
+            if total < best_distance:
+                best_distance = int(total)
+                best_route = list(prefix)
+            return
+
+        # Prune: even the optimistic completion can't beat the incumbent
+        bound = partial + min_out[current]
+        for u in range(1, n):
+            if not (visited_mask >> u) & 1:
+                bound += min_out[u]
+        if bound >= best_distance:
+            return
+
+        for nxt in range(1, n):
+            if (visited_mask >> nxt) & 1:
+                continue
+            prefix.append(nxt)
+            dfs(nxt, visited_mask | (1 << nxt), partial + D[current, nxt])
+            prefix.pop()
+
+    dfs(0, 1, 0)
+
+    if state['timed_out']:
+        print(f"    TIMEOUT after searching {state['nodes']:,} nodes")
+        return None, None
+
+    return best_route, best_distance / DISTANCE_SCALE
+
+# ============================================================================
+# HELD-KARP DYNAMIC PROGRAMMING
+# ============================================================================
+
+def tsp_held_karp(distances, timeout=60):
+    """
+    Find optimal TSP route using the Held-Karp dynamic programming algorithm.
+
+    Instead of enumerating all (n-1)! permutations, this solves subproblems of
+    the form "cheapest path from the start through a subset S of locations,
+    ending at location k", encoded as a bitmask over S. Runtime is O(n^2 * 2^n),
+    which makes n=20 feasible in seconds where brute force needs centuries.
+
+    Args:
+        distances: 2D list where distances[i][j] is distance from location i to j
+        timeout: Maximum seconds to run before stopping (default 60)
+
+    Returns:
+        Tuple of (best_route, best_distance) or (None, None) if timeout
+    """
+    n = len(distances)
+    if n == 1:
+        return [0], 0
+
+    deadline = time.monotonic() + timeout
+    inf = float('inf')
+
+    # Subsets are bitmasks over locations 1..n-1 (bit k-1 represents location k).
+    # dp[mask][k] = cheapest cost of a path 0 -> ... -> k visiting exactly the
+    # locations in mask; parent[mask][k] = location visited just before k.
+    num_subsets = 1 << (n - 1)
+
+    if CUPY_AVAILABLE and n >= 18:
+        # Large instances go to the GPU: each popcount layer is one batch
+        # of device-wide min reductions
+        dp, parent = _held_karp_cupy(np.asarray(distances, dtype=np.float64))
+        if time.monotonic() > deadline:
+            print("    TIMEOUT during DP table fill")
+            return None, None
+    elif NUMBA_AVAILABLE:
+        # Native-compiled table fill; fast enough that the timeout only
+        # needs checking around it, not inside
+        dp, parent = _held_karp_numba(np.asarray(distances, dtype=np.float64))
+        if time.monotonic() > deadline:
+            print("    TIMEOUT during DP table fill")
+            return None, None
+    else:
+        # Flat float64/int8 tables: 8 B and 1 B per cell instead of ~28 B
+        # boxed Python objects, and each dp row is one contiguous scan
+        D = np.asarray(distances, dtype=np.float64)
+        dp = np.full((num_subsets, n), np.inf)
+        parent = np.full((num_subsets, n), -1, dtype=np.int8)
+
+        # Base case: go directly from the start to each location k
+        for k in range(1, n):
+            dp[1 << (k - 1), k] = D[0, k]
+            parent[1 << (k - 1), k] = 0
+
+        # Push-style transition, one predecessor subset at a time: subsets
+        # are enumerated by size with itertools.combinations (so each layer
+        # only reads the one below it), and each subset J is extended to
+        # every location k outside it with a single broadcast add and
+        # column-wise min/argmin. The former scalar j loop is now a SIMD
+        # reduction down the J axis.
+        for size in range(1, n - 1):
+            if time.monotonic() > deadline:
+                print(f"    TIMEOUT while processing subsets of size {size}")
+                return None, None
+
+            for members in itertools.combinations(range(1, n), size):
+                prev_mask = 0
+                for c in members:
+                    prev_mask |= 1 << (c - 1)
+                J = np.array(members)
+                targets = np.array([k for k in range(1, n)
+                                    if not (prev_mask >> (k - 1)) & 1])
+
+                # Row r of cand is the cost of reaching each target k with
+                # J[r] as the last stop before k
+                cand = dp[prev_mask, J][:, None] + D[np.ix_(J, targets)]
+                rows = cand.argmin(axis=0)
+
+                # Each (prev_mask | bit(k), k) cell has exactly this one
+                # predecessor subset, so these writes never collide
+                new_masks = prev_mask | (1 << (targets - 1))
+                dp[new_masks, targets] = cand[rows, np.arange(len(targets))]
+                parent[new_masks, targets] = J[rows]
+
+    # Close the tour: return to the start from the best final location
+    full_mask = num_subsets - 1
+    best_distance = inf
+    last = -1
+    for k in range(1, n):
+        cost = float(dp[full_mask][k]) + distances[k][0]
+        if cost < best_distance:
+            best_distance = cost
+            last = k
+
+    # Reconstruct route by backtracking through parent. The accumulator is
+    # an array.array of signed bytes (1 B per location vs ~28 B per boxed
+    # int); converted to a list at the end to keep the return type.
+    route = array.array('b')
+    mask = full_mask
+    k = last
+    while k != 0:
+        route.append(k)
+        prev = int(parent[mask][k])
+        mask ^= 1 << (k - 1)
+        k = prev
+    route.append(0)
+    route.reverse()
+
+    return list(route), best_distance
+
+def tsp_held_karp_memo(distances, timeout=60):
+    """
+    Find optimal TSP route using recursive Held-Karp with memoization.
+
+    Same algorithm as tsp_held_karp, written top-down: "what is the cheapest
+    way to finish the tour from location `last`, having visited the locations
+    in `mask`?" The @lru_cache turns the exponential recomputation of the
+    plain recursion into one evaluation per (mask, last) state, which makes
+    the memoization speedup easy to see next to tsp_brute_force.
+
+    Args:
+        distances: 2D list where distances[i][j] is distance from location i to j
+        timeout: Accepted for interface compatibility; the recursion is not
+            interruptible mid-flight
+
+    Returns:
+        Tuple of (best_route, best_distance)
+    """
+    n = len(distances)
+    if n == 1:
+        return [0], 0
+
+    # The recursion does scalar lookups by the million; nested lists are
+    # faster than ndarray scalar indexing for that access pattern
+    if isinstance(distances, np.ndarray):
+        distances = distances.tolist()
+
+    full_mask = (1 << n) - 1
+    choice = {}
+
+    # Defined locally so each call gets a fresh cache for its own
+    # distance matrix (the closure captures `distances`).
+    @functools.lru_cache(maxsize=None)
+    def cost_to_finish(mask, last):
+        if mask == full_mask:
+            return distances[last][0]
+        best_cost = float('inf')
+        best_next = -1
+        remaining = ~mask & full_mask
+        while remaining:
+            bit = remaining & -remaining
+            nxt = bit.bit_length() - 1
+            remaining ^= bit
+            cost = distances[last][nxt] + cost_to_finish(mask | bit, nxt)
+            if cost < best_cost:
+                best_cost = cost
+                best_next = nxt
+        choice[(mask, last)] = best_next
+        return best_cost
+
+    best_distance = cost_to_finish(1, 0)
+
+    # Follow the recorded choices to rebuild the route
+    route = array.array('b', [0])
+    mask, last = 1, 0
+    while mask != full_mask:
+        nxt = choice[(mask, last)]
+        route.append(nxt)
+        mask |= 1 << nxt
+        last = nxt
+
+    cost_to_finish.cache_clear()
+    return list(route), best_distance
+
 # ============================================================================
 # NEAREST NEIGHBOR APPROXIMATION
 # ============================================================================
@@ -76,96 +557,192 @@ def tsp_nearest_neighbor(distances, start=0):
     Returns:
         Tuple of (route, total_distance)
     """
-    n = len(distances)
-    
-    # Track which locations we've visited
-    unvisited = set(range(n))
+    D = np.asarray(distances, dtype=np.float64)
+    n = D.shape[0]
+
+    # Track which locations we've visited with a boolean mask
+    visited = np.zeros(n, dtype=bool)
+    visited[start] = True
     current = start
-    route = [current]
-    unvisited.remove(current)
-    total_distance = 0
-    
+    route = array.array('b', [current])
+    total_distance = 0.0
+
     # Visit each location
-    while unvisited:
-        # Find nearest unvisited location
-        nearest = min(unvisited, key=lambda x: distances[current][x])
-        
+    for _ in range(n - 1):
+        # Find nearest unvisited location: mask out visited entries and
+        # take the argmin of the row in one C-level scan
+        row = D[current].copy()
+        row[visited] = np.inf
+        nearest = int(row.argmin())
+
         # Travel to nearest location
-        total_distance += distances[current][nearest]
+        total_distance += D[current, nearest]
         current = nearest
         route.append(current)
-        unvisited.remove(current)
-    
+        visited[current] = True
+
     # Return to start
-    total_distance += distances[current][start]
-    
-    return route, total_distance
+    total_distance += D[current, start]
+
+    return list(route), float(total_distance)
+
+# ============================================================================
+# 2-OPT LOCAL SEARCH
+# ============================================================================
+
+def tsp_two_opt(distances, route=None, max_iter=200):
+    """
+    Improve an approximate TSP route with 2-opt local search.
+
+    Reversing the segment route[i..j] replaces edges (i-1, i) and (j, j+1)
+    with (i-1, j) and (i, j+1); whenever that swap shortens the tour, take
+    it. All O(n^2) candidate deltas are evaluated at once with NumPy
+    broadcasting, and the best negative one is applied per pass. Typically
+    trims a nearest-neighbor tour by 10-25% in well under a millisecond
+    at these sizes.
+
+    Args:
+        distances: 2D list where distances[i][j] is distance from location i to j
+        route: Starting tour (defaults to the nearest neighbor route)
+        max_iter: Safety cap on improvement passes (default 200)
+
+    Returns:
+        Tuple of (route, total_distance)
+    """
+    D = np.asarray(distances, dtype=np.float64)
+    n = D.shape[0]
+
+    if route is None:
+        route, _ = tsp_nearest_neighbor(distances)
+    route = np.asarray(route, dtype=np.intp)
+
+    if n >= 4:
+        # Segment bounds i <= j over positions 1..n-1: keeping i >= 1
+        # leaves the dispatch center fixed at position 0, and j+1 wraps
+        # to the closing edge back to the start
+        i_idx, j_idx = np.triu_indices(n - 1, k=1)
+        i_idx = i_idx + 1
+        j_idx = j_idx + 1
+        j_next = (j_idx + 1) % n
+
+        for _ in range(max_iter):
+            removed = D[route[i_idx - 1], route[i_idx]] + D[route[j_idx], route[j_next]]
+            added = D[route[i_idx - 1], route[j_idx]] + D[route[i_idx], route[j_next]]
+            delta = added - removed
+
+            m = int(delta.argmin())
+            if delta[m] >= -1e-10:
+                break
+            i, j = i_idx[m], j_idx[m]
+            route[i:j + 1] = route[i:j + 1][::-1]
+
+    total_distance = float(D[route, np.roll(route, -1)].sum())
+    return route.tolist(), total_distance
 
 # ============================================================================
 # TESTING AND TIMING UTILITIES
 # ============================================================================
 
+# Exact algorithms selectable from the command line via --algo=NAME.
+# Held-Karp is the default; the brute force path is kept for the
+# pedagogical comparison against the factorial-time baseline.
+EXACT_ALGORITHMS = {
+    'held-karp': tsp_held_karp,
+    'held-karp-memo': tsp_held_karp_memo,
+    'branch-and-bound': tsp_branch_and_bound,
+    'brute': tsp_brute_force,
+    'brute-parallel': tsp_brute_force_parallel,
+}
+
+@functools.lru_cache(maxsize=None)
 def load_dataset(size):
-    """Load emergency site dataset of given size."""
+    """
+    Load emergency site dataset of given size.
+
+    Cached: the timing routines each load the same files, so every size is
+    read and parsed at most once per run. Callers must treat the returned
+    dictionary as read-only.
+    """
     filename = f'data/sites_{size}.json'
     if not Path(filename).exists():
         print(f"Error: {filename} not found. Run location_generator.py first.")
         sys.exit(1)
-    
-    with open(filename, 'r') as f:
-        return json.load(f)
 
-def test_small_cases():
+    if orjson is not None:
+        data = orjson.loads(Path(filename).read_bytes())
+    else:
+        with open(filename, 'r') as f:
+            data = json.load(f)
+
+    # One contiguous float64 copy of the matrix, shared by every consumer,
+    # so the timing routines measure the algorithms rather than repeated
+    # list-to-array conversion
+    data['D'] = np.ascontiguousarray(data['distances'], dtype=np.float64)
+    return data
+
+def test_small_cases(algo='held-karp'):
     """Test both algorithms on small datasets with known correct results."""
     print("\n" + "="*70)
     print("TESTING: Small Cases (Verifying Correctness)")
     print("="*70)
-    
+
+    exact_solver = EXACT_ALGORITHMS[algo]
     test_sizes = [5, 8, 10]
-    
+
     for size in test_sizes:
         print(f"\nTesting {size} locations...")
         data = load_dataset(size)
-        distances = data['distances']
-        
-        # Test brute force
-        route_bf, dist_bf = tsp_brute_force(distances)
-        print(f"  Brute Force: Distance = {dist_bf:.2f}")
-        
+        distances = data['D']
+
+        # Test exact algorithm
+        route_exact, dist_exact = exact_solver(distances)
+        print(f"  Exact ({algo}): Distance = {dist_exact:.2f}")
+
         # Test nearest neighbor
         route_nn, dist_nn = tsp_nearest_neighbor(distances)
         print(f"  Nearest Neighbor: Distance = {dist_nn:.2f}")
-        print(f"  Approximation Quality: {(dist_nn/dist_bf)*100:.1f}% of optimal")
+        print(f"  Approximation Quality: {(dist_nn/dist_exact)*100:.1f}% of optimal")
 
-def time_brute_force():
-    """Time brute force algorithm on increasing dataset sizes."""
+def time_brute_force(algo='held-karp'):
+    """Time the exact algorithm on increasing dataset sizes."""
     print("\n" + "="*70)
-    print("TIMING: Brute Force Algorithm")
+    print(f"TIMING: Exact Algorithm ({algo})")
     print("="*70)
     print("\nWARNING: Larger sizes may take several minutes or timeout at 60 seconds")
-    
-    sizes = [5, 8, 10, 12, 15]
-    
-    print(f"\n{'Size':<6} {'Routes':<15} {'Time (s)':<12} {'Distance':<12} {'Status'}")
+
+    exact_solver = EXACT_ALGORITHMS[algo]
+
+    # Held-Karp can handle all generated sizes; the factorial-worst-case
+    # algorithms stall beyond 15
+    if algo.startswith('held-karp'):
+        sizes = [5, 8, 10, 12, 15, 20]
+    else:
+        sizes = [5, 8, 10, 12, 15]
+
+    print(f"\n{'Size':<6} {'Work':<18} {'Time (s)':<12} {'Distance':<12} {'Status'}")
     print("-" * 70)
-    
+
     for size in sizes:
         data = load_dataset(size)
-        distances = data['distances']
-        
-        # Calculate number of routes to check
+        distances = data['D']
+
+        # Amount of work: n * 2^(n-1) table entries for Held-Karp,
+        # (n-1)! routes for brute force (worst case for branch and bound)
         import math
-        num_routes = math.factorial(size - 1)  # (n-1)! for fixed start
-        
+        if algo.startswith('held-karp'):
+            work = size * (1 << (size - 1))
+        else:
+            work = math.factorial(size - 1)
+
         # Time the algorithm
         start_time = time.time()
-        route, distance = tsp_brute_force(distances, timeout=60)
+        route, distance = exact_solver(distances, timeout=60)
         elapsed = time.time() - start_time
-        
+
         if route is None:
-            print(f"{size:<6} {num_routes:<15,} {elapsed:<12.3f} {'N/A':<12} TIMEOUT")
+            print(f"{size:<6} {work:<18,} {elapsed:<12.3f} {'N/A':<12} TIMEOUT")
         else:
-            print(f"{size:<6} {num_routes:<15,} {elapsed:<12.3f} {distance:<12.2f} Complete")
+            print(f"{size:<6} {work:<18,} {elapsed:<12.3f} {distance:<12.2f} Complete")
 
 def time_approximation():
     """Time nearest neighbor approximation on increasing dataset sizes."""
@@ -175,55 +752,62 @@ def time_approximation():
     
     sizes = [5, 8, 10, 12, 15, 20]
     
-    print(f"\n{'Size':<6} {'Time (s)':<12} {'Distance':<12}")
-    print("-" * 40)
-    
+    print(f"\n{'Size':<6} {'NN Time (s)':<13} {'NN Dist':<10} {'2-opt Time (s)':<16} {'2-opt Dist':<12}")
+    print("-" * 60)
+
     for size in sizes:
         data = load_dataset(size)
-        distances = data['distances']
-        
-        # Time the algorithm
+        distances = data['D']
+
+        # Time nearest neighbor
         start_time = time.time()
-        route, distance = tsp_nearest_neighbor(distances)
-        elapsed = time.time() - start_time
-        
-        print(f"{size:<6} {elapsed:<12.6f} {distance:<12.2f}")
+        route_nn, dist_nn = tsp_nearest_neighbor(distances)
+        time_nn = time.time() - start_time
 
-def compare_all_approaches():
-    """Compare brute force and approximation side-by-side."""
+        # Time 2-opt refinement of the nearest neighbor route
+        start_time = time.time()
+        route_2opt, dist_2opt = tsp_two_opt(distances, route_nn)
+        time_2opt = time.time() - start_time
+
+        print(f"{size:<6} {time_nn:<13.6f} {dist_nn:<10.2f} {time_2opt:<16.6f} {dist_2opt:<12.2f}")
+
+def compare_all_approaches(algo='held-karp'):
+    """Compare the exact algorithm and approximation side-by-side."""
     print("\n" + "="*70)
-    print("COMPARISON: Brute Force vs Nearest Neighbor")
+    print(f"COMPARISON: Exact ({algo}) vs Nearest Neighbor")
     print("="*70)
-    print("\nThis compares both algorithms on datasets where brute force completes.")
-    
+    print("\nThis compares both algorithms on datasets where the exact solver completes.")
+
+    exact_solver = EXACT_ALGORITHMS[algo]
     sizes = [5, 8, 10]
-    
-    print(f"\n{'Size':<6} {'Optimal':<12} {'Approx':<12} {'% of Optimal':<14} {'BF Time (s)':<14} {'NN Time (s)':<12}")
-    print("-" * 90)
-    
+
+    print(f"\n{'Size':<6} {'Optimal':<10} {'NN':<10} {'NN %':<8} {'2-opt':<10} {'2-opt %':<9} {'Exact Time (s)':<16}")
+    print("-" * 75)
+
     for size in sizes:
         data = load_dataset(size)
-        distances = data['distances']
-        
-        # Brute force
-        start_time = time.time()
-        route_bf, dist_bf = tsp_brute_force(distances, timeout=60)
-        time_bf = time.time() - start_time
-        
-        # Nearest neighbor
+        distances = data['D']
+
+        # Exact algorithm
         start_time = time.time()
+        route_exact, dist_exact = exact_solver(distances, timeout=60)
+        time_exact = time.time() - start_time
+
+        # Nearest neighbor, then 2-opt refinement of its route
         route_nn, dist_nn = tsp_nearest_neighbor(distances)
-        time_nn = time.time() - start_time
-        
-        if route_bf is None:
-            print(f"{size:<6} {'TIMEOUT':<12} {dist_nn:<12.2f} {'N/A':<14} {'TIMEOUT':<14} {time_nn:<12.6f}")
+        route_2opt, dist_2opt = tsp_two_opt(distances, route_nn)
+
+        if route_exact is None:
+            print(f"{size:<6} {'TIMEOUT':<10} {dist_nn:<10.2f} {'N/A':<8} {dist_2opt:<10.2f} {'N/A':<9} {'TIMEOUT':<16}")
         else:
-            quality = (dist_nn / dist_bf) * 100
-            print(f"{size:<6} {dist_bf:<12.2f} {dist_nn:<12.2f} {quality:<14.1f} {time_bf:<14.3f} {time_nn:<12.6f}")
-    
+            nn_pct = (dist_nn / dist_exact) * 100
+            opt2_pct = (dist_2opt / dist_exact) * 100
+            print(f"{size:<6} {dist_exact:<10.2f} {dist_nn:<10.2f} {nn_pct:<8.1f} {dist_2opt:<10.2f} {opt2_pct:<9.1f} {time_exact:<16.3f}")
+
     print("\n" + "="*70)
     print("Note: Approximation runs in polynomial time, handling larger sizes easily.")
-    print("Brute force becomes impractical beyond 12-15 locations.")
+    print("Brute force becomes impractical beyond 12-15 locations; Held-Karp")
+    print("extends the exact range to around 20.")
     print("="*70)
 
 # ============================================================================
@@ -232,12 +816,14 @@ def compare_all_approaches():
 
 def print_usage():
     """Print usage instructions."""
-    print("\nUsage: python tsp_solver.py [option]")
+    print("\nUsage: python tsp_solver.py [option] [--algo=NAME]")
     print("\nOptions:")
     print("  --test-small        Test correctness on small datasets")
-    print("  --time-brute-force  Time brute force on increasing sizes")
+    print("  --time-brute-force  Time the exact algorithm on increasing sizes")
     print("  --time-approximation Time approximation on increasing sizes")
     print("  --compare-all       Compare both algorithms side-by-side")
+    print("  --algo=NAME         Exact algorithm to use: " + ", ".join(EXACT_ALGORITHMS))
+    print("                      (default: held-karp)")
     print("  --help              Show this help message")
     print("\nFor the assignment, run these commands in order:")
     print("  1. python tsp_solver.py --test-small")
@@ -247,12 +833,25 @@ def print_usage():
 
 def main():
     """Main entry point for running timing experiments."""
-    if len(sys.argv) < 2:
+    args = sys.argv[1:]
+
+    # Pull out the exact-algorithm selector if present
+    algo = 'held-karp'
+    for arg in list(args):
+        if arg.startswith('--algo='):
+            algo = arg.split('=', 1)[1]
+            args.remove(arg)
+            if algo not in EXACT_ALGORITHMS:
+                print(f"\nError: Unknown algorithm '{algo}'")
+                print("Available: " + ", ".join(EXACT_ALGORITHMS))
+                sys.exit(1)
+
+    if not args:
         print_usage()
         return
-    
-    option = sys.argv[1]
-    
+
+    option = args[0]
+
     # Check if data files exist
     if not Path('data/sites_5.json').exists():
         print("\nError: Data files not found!")
@@ -261,13 +860,13 @@ def main():
         sys.exit(1)
     
     if option == '--test-small':
-        test_small_cases()
+        test_small_cases(algo)
     elif option == '--time-brute-force':
-        time_brute_force()
+        time_brute_force(algo)
     elif option == '--time-approximation':
         time_approximation()
     elif option == '--compare-all':
-        compare_all_approaches()
+        compare_all_approaches(algo)
     elif option == '--help':
         print_usage()
     else: